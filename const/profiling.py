@@ -0,0 +1,7 @@
+PROFILE_HEADER = 'X-Profile'
+ADMIN_TOKEN_HEADER = 'X-Admin-Token'
+REQUEST_ID_HEADER = 'X-Request-Id'
+REQUEST_ID_PATTERN = r'^[A-Za-z0-9_-]{1,64}$'
+PROFILE_KEY = 'profile:{request_id}'
+TRUE_VALUES = ('1', 'true', 'yes', 'on')
+WAITING_FRAME = '<waiting>'
\ No newline at end of file
@@ -0,0 +1,2 @@
+INTERACTIVE = 0
+BULK = 1
\ No newline at end of file
@@ -0,0 +1,2 @@
+PARQUET = 'parquet'
+ARROW = 'arrow'
\ No newline at end of file
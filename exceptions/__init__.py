@@ -3,3 +3,16 @@ class ImageInfoError(Exception):
     Handles all the errors coming from any image exception.
     """
     pass
+
+
+class JobIdError(Exception):
+    """
+    Raised when a job id is already used by an active job.
+    """
+    pass
+
+class TooManyJobsError(Exception):
+    """
+    Raised when there are already too many active jobs of a priority.
+    """
+    pass
\ No newline at end of file
@@ -10,8 +10,9 @@ def create_app(config_obj='mlteam.config.DevelopmentConfig'):
     from v1.blueprint import api_bp
     app.register_blueprint(api_bp, url_prefix='/api')
 
-    from mlteam.extensions import redis_client
+    from mlteam.extensions import redis_client, scheduler
     redis_client.init_app(app)
+    scheduler.init_app(app)
 
     from flask_cors import CORS
     CORS(app)
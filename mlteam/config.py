@@ -5,21 +5,46 @@ class Config(object):
     DEBUG = False
     TESTING = False
     REDIS_URL = ""
-    MAX_WORKERS_CONCURRENCY = 2
+    MAX_WORKERS_CONCURRENCY = 8
+    # Per job cap, so a single bulk job can not take all the workers.
+    BULK_JOB_MAX_CONCURRENCY = 6
+    # Concurrent BULK jobs, each one holds a gunicorn thread until it ends,
+    # so it has to stay below the --threads of the Dockerfile.
+    MAX_BULK_JOBS = 4
+    # Larger images_info requests are scheduled as BULK jobs.
+    INTERACTIVE_MAX_IMAGES = 100
+    # Weighted fair queuing weight of each tenant, 1 if it is not listed.
+    TENANT_WEIGHTS = {}
+    RESULTS_DIR = os.path.abspath(os.path.join(BASE_DIR, os.pardir, 'results'))
+    SINK_BATCH_SIZE = 1000
+    # Token of the admin endpoints and of the PROFILE_HEADER header, both are
+    # disabled without it.
+    ADMIN_TOKEN = os.environ.get('ADMIN_TOKEN')
+    PROFILING_ENABLED = False
+    PROFILING_SAMPLE_RATE = 0.0
+    PROFILING_INTERVAL = 0.005
+    PROFILING_TTL = 24 * 60 * 60
 
 
 class ProductionConfig(Config):
     REDIS_URL = "redis://redis:6379/0"
-    MAX_WORKERS_CONCURRENCY = 4
+    MAX_WORKERS_CONCURRENCY = 8
+    BULK_JOB_MAX_CONCURRENCY = 6
+    RESULTS_DIR = "/application/vol/results"
+    PROFILING_SAMPLE_RATE = 0.001
 
 
 class DevelopmentConfig(Config):
     DEBUG = True
     REDIS_URL = "redis://localhost:6379/0"
-    MAX_WORKERS_CONCURRENCY = 6
+    MAX_WORKERS_CONCURRENCY = 8
+    BULK_JOB_MAX_CONCURRENCY = 6
 
 
 class TestingConfig(Config):
     TESTING = True
     REDIS_URL = "redis://localhost:6379/0"
+    ADMIN_TOKEN = "tst-token"
+    MAX_BULK_JOBS = 2
     MAX_WORKERS_CONCURRENCY = 4
+    BULK_JOB_MAX_CONCURRENCY = 3
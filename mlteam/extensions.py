@@ -1,5 +1,8 @@
 from requests import Session
 from flask_redis import FlaskRedis
 
+from mlteam.scheduler import Scheduler
+
 session = Session()
 redis_client = FlaskRedis()
+scheduler = Scheduler()
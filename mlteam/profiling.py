@@ -0,0 +1,165 @@
+import hmac
+import os
+import random
+import re
+import sys
+import threading
+import uuid
+from collections import Counter
+from functools import wraps
+
+from flask import after_this_request, current_app, request
+from redis.exceptions import RedisError
+
+from const.profiling import (
+    ADMIN_TOKEN_HEADER, PROFILE_HEADER, PROFILE_KEY, REQUEST_ID_HEADER,
+    REQUEST_ID_PATTERN, TRUE_VALUES, WAITING_FRAME,
+)
+from mlteam.extensions import redis_client, scheduler
+
+
+class SamplingProfiler(object):
+    """
+    Low overhead sampling profiler. A background thread takes, each
+    'interval' seconds, the stack of the thread that started the profiler and
+    of the scheduler workers running tasks of its jobs, and counts them in the
+    collapsed-stack format used by flamegraph.pl. Threads blocked in a wait,
+    like the handler waiting for its queued tasks, end in WAITING_FRAME.
+    """
+
+    def __init__(self, interval=0.005, scheduler=None):
+        self.interval = interval
+        self.stacks = Counter()
+        self.ident = None
+        self._scheduler = scheduler
+        self._stop = threading.Event()
+        self._thread = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def _frame_name(self, frame):
+        code = frame.f_code
+        return '{name} ({filename}:{line})'.format(
+            name=code.co_name,
+            filename=os.path.basename(code.co_filename),
+            line=code.co_firstlineno,
+        )
+
+    def _waiting(self, frame):
+        code = frame.f_code
+        return code.co_filename == threading.__file__ and code.co_name == 'wait'
+
+    def _sample(self):
+        idents = {self.ident}
+        if self._scheduler is not None:
+            idents |= self._scheduler.threads_of(self.ident)
+        thread_names = {t.ident: t.name for t in threading.enumerate()}
+        frames = sys._current_frames()
+        for ident in idents:
+            frame = frames.get(ident)
+            if frame is None:
+                continue
+            stack = []
+            if self._waiting(frame):
+                stack.append(WAITING_FRAME)
+                # Event.wait calls Condition.wait, both are part of the wait.
+                while frame is not None and self._waiting(frame):
+                    frame = frame.f_back
+            while frame is not None:
+                stack.append(self._frame_name(frame))
+                frame = frame.f_back
+            stack.append(thread_names.get(ident, str(ident)))
+            self.stacks[';'.join(reversed(stack))] += 1
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+    def start(self):
+        self.ident = threading.get_ident()
+        self._thread = threading.Thread(target=self._run, name='profiler', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def collapsed(self):
+        """
+        Returns the samples as collapsed stacks, one 'frame;frame count' line
+        per distinct stack.
+        """
+        return '\n'.join(
+            '{stack} {count}'.format(stack=stack, count=count)
+            for stack, count in self.stacks.most_common()
+        )
+
+
+def is_admin():
+    """
+    Returns True if the request carries the ADMIN_TOKEN of the current app.
+    """
+    token = current_app.config['ADMIN_TOKEN']
+    given = request.headers.get(ADMIN_TOKEN_HEADER)
+    if not token or not given:
+        return False
+    return hmac.compare_digest(token.encode(), given.encode())
+
+
+def _profile_requested():
+    value = request.headers.get(PROFILE_HEADER, '')
+    return value.strip().lower() in TRUE_VALUES and is_admin()
+
+
+def _should_profile():
+    config = current_app.config
+    if config['PROFILING_ENABLED'] or _profile_requested():
+        return True
+    return random.random() < config['PROFILING_SAMPLE_RATE']
+
+
+def _request_id():
+    # Only admins choose the request id, so nobody else can overwrite a
+    # stored profile.
+    request_id = request.headers.get(REQUEST_ID_HEADER, '')
+    if is_admin() and re.match(REQUEST_ID_PATTERN, request_id):
+        return request_id
+    return uuid.uuid4().hex
+
+
+def profiled(func):
+    """
+    Resource method decorator that profiles the request when it is enabled by
+    the PROFILING_ENABLED flag, the PROFILING_SAMPLE_RATE or, for admins, the
+    PROFILE_HEADER header. The collapsed stacks are stored in Redis keyed by
+    the request id, which is returned in the REQUEST_ID_HEADER header. A
+    profile that can not be stored is logged and never fails the request.
+    """
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        if not _should_profile():
+            return func(*args, **kwargs)
+        request_id = _request_id()
+        interval = current_app.config['PROFILING_INTERVAL']
+        with SamplingProfiler(interval=interval, scheduler=scheduler) as profiler:
+            response = func(*args, **kwargs)
+        try:
+            redis_client.set(
+                PROFILE_KEY.format(request_id=request_id),
+                profiler.collapsed(),
+                ex=current_app.config['PROFILING_TTL'],
+            )
+        except RedisError:
+            current_app.logger.exception('Profile of request %s could not be stored', request_id)
+        else:
+            @after_this_request
+            def add_request_id(resp):
+                resp.headers[REQUEST_ID_HEADER] = request_id
+                return resp
+        return response
+    return wrapper
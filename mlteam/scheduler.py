@@ -0,0 +1,206 @@
+import threading
+import uuid
+from collections import deque
+from concurrent.futures import Future
+
+from const.scheduler import INTERACTIVE, BULK
+from exceptions import JobIdError, TooManyJobsError
+
+
+class Job(object):
+    """
+    A group of tasks scheduled together. Jobs of the same priority share the
+    workers by weighted fair queuing between their flows, the tenant of the
+    job or the job itself, and a job never runs more than 'max_concurrency'
+    tasks at once.
+    """
+
+    def __init__(self, scheduler, job_id, priority, tenant=None, weight=1, max_concurrency=None):
+        self.id = job_id
+        self.priority = priority
+        self.flow = (priority, tenant if tenant is not None else job_id)
+        self.weight = weight
+        self.max_concurrency = max_concurrency
+        self.cancelled = False
+        self.running = 0
+        # Thread that created the job, usually the one handling the request.
+        self.owner = threading.get_ident()
+        # Virtual finish time of the last dispatched task, orders the jobs
+        # sharing a flow.
+        self.finish_time = 0.0
+        self._pending = deque()
+        self._scheduler = scheduler
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is not None:
+            self.cancel()
+        self._scheduler._unregister(self)
+
+    def _runnable(self):
+        if not self._pending:
+            return False
+        return self.max_concurrency is None or self.running < self.max_concurrency
+
+    def submit(self, fn, *args, **kwargs):
+        """
+        Schedules fn(*args, **kwargs) and returns a Future of its result.
+        """
+        return self._scheduler._submit(self, fn, args, kwargs)
+
+    def cancel(self):
+        """
+        Cancels the pending tasks of the job. Running tasks are not stopped.
+        """
+        self._scheduler._cancel(self)
+
+
+class Scheduler(object):
+    """
+    In-process scheduler shared by all the image work. Tasks of INTERACTIVE
+    jobs always run before the BULK ones, and flows of the same priority are
+    served with weighted fair queuing.
+    """
+
+    def __init__(self, max_workers=2):
+        self.max_workers = max_workers
+        self._jobs = {}
+        self._active = []
+        self._virtual_time = {INTERACTIVE: 0.0, BULK: 0.0}
+        # Virtual finish time of the last dispatched task of each flow.
+        self._flow_times = {}
+        self._threads = []
+        # Job of the task each busy worker thread is running.
+        self._running = {}
+        self._condition = threading.Condition()
+
+    def init_app(self, app):
+        self.max_workers = app.config['MAX_WORKERS_CONCURRENCY']
+
+    def job(self, priority=INTERACTIVE, job_id=None, tenant=None, weight=1,
+            max_concurrency=None, max_jobs=None):
+        """
+        Returns a new Job registered with the given job_id, or a random one.
+        Raises JobIdError if job_id is used by another active job, and
+        TooManyJobsError if there are already max_jobs jobs of the priority.
+        """
+        job = Job(self, job_id or uuid.uuid4().hex, priority, tenant, weight, max_concurrency)
+        with self._condition:
+            if job.id in self._jobs:
+                raise JobIdError('Job id {id} is already in use.'.format(id=job.id))
+            if max_jobs is not None:
+                n_jobs = sum(1 for j in self._jobs.values() if j.priority == priority)
+                if n_jobs >= max_jobs:
+                    raise TooManyJobsError('Too many jobs in progress, try again later.')
+            self._jobs[job.id] = job
+        return job
+
+    def cancel(self, job_id):
+        """
+        Cancels the job with the given id. Returns False if it does not exist.
+        """
+        job = self._jobs.get(job_id)
+        if job is None:
+            return False
+        job.cancel()
+        return True
+
+    def threads_of(self, owner):
+        """
+        Returns the idents of the workers running tasks of the jobs created by
+        the owner thread.
+        """
+        with self._condition:
+            return {ident for ident, job in self._running.items() if job.owner == owner}
+
+    def _unregister(self, job):
+        with self._condition:
+            if self._jobs.get(job.id) is job:
+                del self._jobs[job.id]
+            jobs = list(self._jobs.values()) + self._active
+            if not any(j.flow == job.flow for j in jobs):
+                self._flow_times.pop(job.flow, None)
+
+    def _start_workers(self):
+        while len(self._threads) < self.max_workers:
+            thread = threading.Thread(
+                target=self._worker,
+                name='scheduler_{n}'.format(n=len(self._threads)),
+                daemon=True,
+            )
+            thread.start()
+            self._threads.append(thread)
+
+    def _cancel_future(self, future):
+        # Notifies the waiters, as concurrent.futures.wait and as_completed
+        # only wake up for the cancelled futures that have been notified.
+        future.cancel()
+        future.set_running_or_notify_cancel()
+
+    def _submit(self, job, fn, args, kwargs):
+        future = Future()
+        with self._condition:
+            if job.cancelled:
+                self._cancel_future(future)
+                return future
+            if not job._pending:
+                # A flow or job becoming active starts at the current virtual
+                # time, so it can not claim the service it missed while idle.
+                virtual_time = self._virtual_time[job.priority]
+                if not any(j.flow == job.flow for j in self._active):
+                    self._flow_times[job.flow] = max(self._flow_times.get(job.flow, 0.0), virtual_time)
+                job.finish_time = max(job.finish_time, self._flow_times[job.flow])
+                self._active.append(job)
+            job._pending.append((future, fn, args, kwargs))
+            self._start_workers()
+            self._condition.notify()
+        return future
+
+    def _cancel(self, job):
+        with self._condition:
+            job.cancelled = True
+            for future, _, _, _ in job._pending:
+                self._cancel_future(future)
+            job._pending.clear()
+            if job in self._active:
+                self._active.remove(job)
+
+    def _next_task(self):
+        runnable = [job for job in self._active if job._runnable()]
+        if not runnable:
+            return None
+        job = min(runnable, key=lambda j: (j.priority, self._flow_times[j.flow], j.finish_time))
+        future, fn, args, kwargs = job._pending.popleft()
+        flow_time = self._flow_times[job.flow]
+        self._virtual_time[job.priority] = max(self._virtual_time[job.priority], flow_time)
+        self._flow_times[job.flow] = flow_time + 1.0 / job.weight
+        job.finish_time += 1.0 / job.weight
+        job.running += 1
+        if not job._pending:
+            self._active.remove(job)
+        return job, future, fn, args, kwargs
+
+    def _worker(self):
+        ident = threading.get_ident()
+        while True:
+            with self._condition:
+                task = self._next_task()
+                while task is None:
+                    self._condition.wait()
+                    task = self._next_task()
+                job, future, fn, args, kwargs = task
+                self._running[ident] = job
+            if future.set_running_or_notify_cancel():
+                try:
+                    result = fn(*args, **kwargs)
+                except BaseException as e:
+                    future.set_exception(e)
+                else:
+                    future.set_result(result)
+            with self._condition:
+                del self._running[ident]
+                job.running -= 1
+                # A slot of a capped job may be free again.
+                self._condition.notify_all()
@@ -0,0 +1,50 @@
+import threading
+import time
+from unittest import TestCase
+
+from const.scheduler import INTERACTIVE
+from mlteam.profiling import SamplingProfiler
+from mlteam.scheduler import Scheduler
+
+
+def busy(seconds):
+    end = time.time() + seconds
+    while time.time() < end:
+        pass
+
+
+class SamplingProfilerTest(TestCase):
+
+    def setUp(self):
+        self.scheduler = Scheduler(max_workers=2)
+        self.stop = threading.Event()
+
+    def test_samples_only_the_profiled_threads(self):
+        other = threading.Thread(target=busy, args=(0.2,), name='other')
+        other.start()
+        with SamplingProfiler(interval=0.001, scheduler=self.scheduler) as profiler:
+            with self.scheduler.job(INTERACTIVE) as job:
+                job.submit(busy, 0.1).result(timeout=5)
+            busy(0.05)
+        other.join()
+        roots = {stack.split(';')[0] for stack in profiler.stacks}
+        self.assertIn(threading.current_thread().name, roots)
+        self.assertNotIn('other', roots)
+        # The worker running the task of the profiled thread is sampled.
+        self.assertTrue(any(
+            stack.startswith('scheduler_') and 'busy' in stack
+            for stack in profiler.stacks
+        ))
+
+    def test_waits_end_in_the_waiting_frame(self):
+        with SamplingProfiler(interval=0.001, scheduler=self.scheduler) as profiler:
+            with self.scheduler.job(INTERACTIVE) as job:
+                job.submit(self.stop.wait, 0.1)
+                self.stop.wait(0.1)
+        self.assertTrue(profiler.stacks)
+        for stack in profiler.stacks:
+            self.assertTrue(stack.endswith(';<waiting>'))
+            self.assertNotIn('wait (threading.py', stack)
+
+    def tearDown(self):
+        self.stop.set()
@@ -0,0 +1,132 @@
+import threading
+from concurrent.futures import CancelledError, as_completed, wait
+from unittest import TestCase
+
+from const.scheduler import INTERACTIVE, BULK
+from exceptions import JobIdError, TooManyJobsError
+from mlteam.scheduler import Scheduler
+
+
+class SchedulerTest(TestCase):
+
+    def setUp(self):
+        self.scheduler = Scheduler(max_workers=1)
+        # Keeps the only worker busy until the tasks under test are queued.
+        self.gate = threading.Event()
+        self.blocker = self.scheduler.job(INTERACTIVE)
+        self.blocker.submit(self.gate.wait)
+        self.order = []
+
+    def _task(self, name):
+        return lambda: self.order.append(name)
+
+    def test_submit_returns_the_result(self):
+        self.gate.set()
+        with self.scheduler.job() as job:
+            future = job.submit(sum, [1, 2, 3])
+            self.assertEqual(future.result(timeout=5), 6)
+
+    def test_interactive_runs_before_bulk(self):
+        bulk = self.scheduler.job(BULK)
+        interactive = self.scheduler.job(INTERACTIVE)
+        bulk_future = bulk.submit(self._task('bulk'))
+        interactive_future = interactive.submit(self._task('interactive'))
+        self.gate.set()
+        bulk_future.result(timeout=5)
+        interactive_future.result(timeout=5)
+        self.assertEqual(self.order, ['interactive', 'bulk'])
+
+    def test_weighted_fair_queuing(self):
+        heavy = self.scheduler.job(BULK, job_id='heavy', weight=2)
+        light = self.scheduler.job(BULK, job_id='light')
+        futures = [heavy.submit(self._task('heavy')) for _ in range(4)]
+        futures += [light.submit(self._task('light')) for _ in range(2)]
+        self.gate.set()
+        for future in futures:
+            future.result(timeout=5)
+        self.assertEqual(self.order, ['heavy', 'light', 'heavy', 'heavy', 'light', 'heavy'])
+
+    def test_tenants_share_the_workers(self):
+        a1 = self.scheduler.job(BULK, job_id='a1', tenant='a')
+        a2 = self.scheduler.job(BULK, job_id='a2', tenant='a')
+        b1 = self.scheduler.job(BULK, job_id='b1', tenant='b')
+        futures = []
+        for job in (a1, a2, b1):
+            futures += [job.submit(self._task(job.id)) for _ in range(2)]
+        self.gate.set()
+        for future in futures:
+            future.result(timeout=5)
+        # The tenant 'a' gets the same share as 'b' even with two jobs.
+        self.assertEqual(self.order, ['a1', 'b1', 'a2', 'b1', 'a1', 'a2'])
+
+    def test_job_id_in_use(self):
+        with self.scheduler.job(BULK, job_id='tst-job'):
+            with self.assertRaises(JobIdError):
+                self.scheduler.job(BULK, job_id='tst-job')
+        # The id is free again once the job is done.
+        with self.scheduler.job(BULK, job_id='tst-job'):
+            pass
+
+    def test_max_jobs(self):
+        # The INTERACTIVE blocker of setUp does not count for BULK.
+        with self.scheduler.job(BULK, max_jobs=1):
+            with self.assertRaises(TooManyJobsError):
+                self.scheduler.job(BULK, max_jobs=1)
+        with self.scheduler.job(BULK, max_jobs=1):
+            pass
+
+    def test_cancel_wakes_up_as_completed(self):
+        self.gate.set()
+        scheduler = Scheduler(max_workers=2)
+        release = threading.Event()
+        # Both workers and the test thread, so the job is cancelled mid-run.
+        running = threading.Barrier(3)
+
+        def task():
+            running.wait(5)
+            release.wait(5)
+
+        with scheduler.job(BULK, job_id='tst-job', max_concurrency=2) as job:
+            futures = [job.submit(task) for _ in range(6)]
+            running.wait(5)
+            scheduler.cancel('tst-job')
+            release.set()
+            done = list(as_completed(futures, timeout=5))
+            self.assertEqual(len(done), 6)
+            self.assertEqual(sum(future.cancelled() for future in futures), 4)
+            # Tasks submitted after the cancellation are notified as well.
+            late = job.submit(release.wait, 5)
+            self.assertEqual(len(wait([late], timeout=5).done), 1)
+
+    def test_cancel_pending_tasks(self):
+        with self.scheduler.job(BULK, job_id='tst-job') as job:
+            future = job.submit(self._task('bulk'))
+            self.assertTrue(self.scheduler.cancel('tst-job'))
+            self.gate.set()
+            with self.assertRaises(CancelledError):
+                future.result(timeout=5)
+            # The new tasks of a cancelled job are cancelled as well.
+            self.assertTrue(job.submit(self._task('bulk')).cancelled())
+        self.assertFalse(self.scheduler.cancel('tst-job'))
+        self.assertEqual(self.order, [])
+
+    def test_max_concurrency(self):
+        self.gate.set()
+        scheduler = Scheduler(max_workers=4)
+        lock = threading.Lock()
+        running = []
+        peak = []
+
+        def task():
+            with lock:
+                running.append(1)
+                peak.append(len(running))
+            threading.Event().wait(0.01)
+            with lock:
+                running.pop()
+
+        with scheduler.job(BULK, max_concurrency=2) as job:
+            futures = [job.submit(task) for _ in range(8)]
+            for future in futures:
+                future.result(timeout=5)
+        self.assertLessEqual(max(peak), 2)
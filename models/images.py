@@ -89,10 +89,26 @@ class BatchImage(object):
     """
     Represents a batch of images.
     """
-    def __init__(self, images=[], batch_size=0, session=None):
+    def __init__(self, images=[], batch_size=0, session=None, job=None):
         self.batch_images = images
         self.batch_size = batch_size
         self._session = session if session else ext_session
+        self._job = job
+
+    def _resize_batch(self, batch, x, y):
+        """
+        Resizes the images of the batch, concurrently through the scheduler job
+        if there is one. Returns the resized images in the batch order and the
+        n_channels of the last one.
+        """
+        if self._job is None:
+            results = [img.resize(x, y) for img in batch]
+        else:
+            futures = [self._job.submit(img.resize, x, y) for img in batch]
+            results = [future.result() for future in futures]
+        # if its a batch every image has its own channel but the result
+        # should be: {batch_size: '(batch_size, ch, 64, 64)', ...}
+        return [r_img for r_img, _ in results], results[-1][1]
 
     def _send_to_redis_queue(self, n_channels, x, y, images, redis_conn, queue=BATCH_PREDICT):
         batch_dimension = '({batch_size}, {ch}, {x}, {y})'.format(
@@ -113,23 +129,16 @@ class BatchImage(object):
         Resize all images to x * y in batches of 'batch_size'. If redis_conn
         is not None, the values are pushed to the given queue.
         """
-        counter = 0
-        n_channels = 0
-        images = deque()
+        batch = deque()
         for image in self.batch_images:
-            if counter < self.batch_size:
-                img = ImageInfo(image.id, image.url, session=self._session)
-                # if its a batch every image has its own channel but the result 
-                # should be: {batch_size: '(batch_size, ch, 64, 64)', ...}
-                r_img, n_channels = img.resize(x, y)
-                images.append(r_img)
-                counter += 1
-            if counter == self.batch_size:
+            batch.append(ImageInfo(image.id, image.url, session=self._session))
+            if len(batch) == self.batch_size:
+                images, n_channels = self._resize_batch(batch, x, y)
                 if redis_conn is not None:
                     self._send_to_redis_queue(n_channels, x, y, images, redis_conn, queue)
-                images.clear()
-                counter = 0
-        if len(images):
+                batch.clear()
+        if len(batch):
+            images, n_channels = self._resize_batch(batch, x, y)
             if redis_conn is not None:
                 self._send_to_redis_queue(n_channels, x, y, images, redis_conn, queue)
-            images.clear()
+            batch.clear()
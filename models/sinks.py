@@ -0,0 +1,130 @@
+import os
+import uuid
+from abc import ABC, abstractmethod
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+IMAGES_INFO_SCHEMA = pa.schema([
+    ('id', pa.int64()),
+    ('url', pa.string()),
+    ('size', pa.int64()),
+    ('width', pa.int32()),
+    ('height', pa.int32()),
+    ('format', pa.string()),
+    ('error', pa.string()),
+])
+
+
+class ColumnarSink(ABC):
+    """
+    Writes ImageInfo.to_dict results into a columnar file, flushing a batch
+    every 'row_group_size' rows so results are streamed as they arrive.
+    Subclasses open, write and close the actual file.
+    """
+    extension = None
+
+    def __init__(self, directory, row_group_size=1000, prefix='images_info'):
+        self.path = os.path.join(
+            directory,
+            '{prefix}_{uid}.{ext}'.format(prefix=prefix, uid=uuid.uuid4().hex, ext=self.extension)
+        )
+        self.row_group_size = row_group_size
+        self._columns = {name: [] for name in IMAGES_INFO_SCHEMA.names}
+        self._writer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    @abstractmethod
+    def _open_writer(self):
+        """
+        Returns the writer of the file at self.path.
+        """
+
+    def _write_table(self, table):
+        self._writer.write_table(table)
+
+    def _close_writer(self):
+        self._writer.close()
+
+    def _to_row(self, img_id, image_dict):
+        image_info = image_dict.get('image_info') or {}
+        width, height = image_info.get('image_dimension', (None, None))
+        return {
+            'id': img_id,
+            'url': image_dict.get('url'),
+            'size': image_info.get('image_size'),
+            'width': width,
+            'height': height,
+            'format': image_info.get('image_format'),
+            'error': image_dict.get('error'),
+        }
+
+    def _ensure_writer(self):
+        if self._writer is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            self._writer = self._open_writer()
+
+    def write(self, img_id, image_dict):
+        """
+        Buffers a to_dict result, flushing a batch when it is full.
+        """
+        row = self._to_row(img_id, image_dict)
+        for name, values in self._columns.items():
+            values.append(row[name])
+        if len(self._columns['id']) >= self.row_group_size:
+            self.flush()
+
+    def flush(self):
+        """
+        Writes the buffered rows as a new batch.
+        """
+        if not self._columns['id']:
+            return
+        self._ensure_writer()
+        table = pa.Table.from_pydict(self._columns, schema=IMAGES_INFO_SCHEMA)
+        self._write_table(table)
+        for values in self._columns.values():
+            values.clear()
+
+    def close(self):
+        """
+        Flushes the pending rows and closes the file. An empty file with the
+        schema is written if no rows were received.
+        """
+        self._ensure_writer()
+        self.flush()
+        self._close_writer()
+
+
+class ParquetSink(ColumnarSink):
+    """
+    Columnar sink writing a Parquet file, one row group per batch.
+    """
+    extension = 'parquet'
+
+    def _open_writer(self):
+        return pq.ParquetWriter(self.path, IMAGES_INFO_SCHEMA)
+
+
+class ArrowSink(ColumnarSink):
+    """
+    Columnar sink writing an Arrow IPC file, one record batch per batch.
+    """
+    extension = 'arrow'
+
+    def _open_writer(self):
+        self._file = pa.OSFile(self.path, 'wb')
+        try:
+            return pa.RecordBatchFileWriter(self._file, IMAGES_INFO_SCHEMA)
+        except Exception:
+            self._file.close()
+            raise
+
+    def _close_writer(self):
+        self._writer.close()
+        self._file.close()
@@ -1,4 +1,5 @@
 from io import BytesIO
+import threading
 from collections import namedtuple
 from unittest.mock import patch
 from unittest import TestCase
@@ -12,8 +13,10 @@ from redis import Redis
 from simplejson import loads
 
 from const.redis_queue import BATCH_PREDICT
+from const.scheduler import BULK
 from exceptions import ImageInfoError
 from mlteam.extensions import session
+from mlteam.scheduler import Scheduler
 from models.images import ImageInfo, BatchImage
 
 # ISSUE: https://github.com/python-pillow/Pillow/issues/1510
@@ -194,5 +197,28 @@ class BatchImageTest(TestCase):
             expected = (64,64,)
             self.assertEqual(np.shape(result['images'][0]), expected)
 
+    def test_resize_batch_images_concurrently(self):
+        ImageInfoTSV = namedtuple('ImageInfoTSV', ['id', 'url'])
+        images = [
+            ImageInfoTSV(id=n, url="https://www.url.com/blank_image_{n}".format(n=n))
+            for n in range(2)
+        ]
+        scheduler = Scheduler(max_workers=2)
+        # Both resizes of the batch must be running at the same time.
+        running = threading.Barrier(2)
+
+        def resize(img, x, y):
+            running.wait(5)
+            return [img.id], 3
+
+        queue = 'queue:tst-batch-predict'
+        with scheduler.job(BULK, max_concurrency=2) as job:
+            batch_images = BatchImage(images=images, batch_size=2, job=job)
+            with patch('models.images.ImageInfo.resize', autospec=True, side_effect=resize):
+                batch_images.resize_batch_images(redis_conn=self.redis_client, queue=queue)
+        result = loads(self.redis_client.rpop(queue))
+        # The images keep the batch order.
+        self.assertEqual(result['images'], [[0], [1]])
+
     def tearDown(self):
         self.redis_client.flushdb()
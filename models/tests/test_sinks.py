@@ -0,0 +1,106 @@
+import os
+import tempfile
+from unittest import TestCase
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from models.sinks import ColumnarSink, ParquetSink, ArrowSink, IMAGES_INFO_SCHEMA
+
+
+class ParquetSinkTest(TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.valid = {
+            "url": "https://www.url.com/blank_image",
+            "image_info": {
+                "image_size": 120,
+                "image_dimension": (64, 32),
+                "image_format": "GIF",
+            }
+        }
+        self.invalid = {
+            "url": "https://www.url.com/invalid_image",
+            "image_info": "",
+            "error": "Image could not be opened.",
+        }
+
+    def test_write_flattens_to_dict_results(self):
+        with ParquetSink(self.tmp_dir.name) as sink:
+            sink.write(0, self.valid)
+            sink.write(1, self.invalid)
+        result = pq.read_table(sink.path).to_pydict()
+        expected = {
+            'id': [0, 1],
+            'url': [self.valid['url'], self.invalid['url']],
+            'size': [120, None],
+            'width': [64, None],
+            'height': [32, None],
+            'format': ['GIF', None],
+            'error': [None, "Image could not be opened."],
+        }
+        self.assertEqual(result, expected)
+
+    def test_write_in_row_groups(self):
+        with ParquetSink(self.tmp_dir.name, row_group_size=2) as sink:
+            for img_id in range(5):
+                sink.write(img_id, self.valid)
+        parquet_file = pq.ParquetFile(sink.path)
+        # 5 rows in groups of 2 -> 2, 2, 1.
+        self.assertEqual(parquet_file.num_row_groups, 3)
+        self.assertEqual(parquet_file.metadata.num_rows, 5)
+
+    def test_close_without_rows_writes_the_schema(self):
+        with ParquetSink(self.tmp_dir.name) as sink:
+            pass
+        self.assertTrue(os.path.exists(sink.path))
+        self.assertEqual(pq.read_schema(sink.path).names, IMAGES_INFO_SCHEMA.names)
+
+    def test_exception_closes_the_file(self):
+        with self.assertRaises(ValueError):
+            with ParquetSink(self.tmp_dir.name, row_group_size=2) as sink:
+                for img_id in range(3):
+                    sink.write(img_id, self.valid)
+                raise ValueError()
+        # The file has its footer and keeps the rows received until the error.
+        self.assertEqual(pq.ParquetFile(sink.path).metadata.num_rows, 3)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+
+class ArrowSinkTest(TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.valid = {
+            "url": "https://www.url.com/blank_image",
+            "image_info": {
+                "image_size": 120,
+                "image_dimension": (64, 32),
+                "image_format": "GIF",
+            }
+        }
+
+    def test_write_in_record_batches(self):
+        with ArrowSink(self.tmp_dir.name, row_group_size=2) as sink:
+            for img_id in range(5):
+                sink.write(img_id, self.valid)
+        self.assertTrue(sink.path.endswith('.arrow'))
+        reader = pa.ipc.open_file(sink.path)
+        # 5 rows in batches of 2 -> 2, 2, 1.
+        self.assertEqual(reader.num_record_batches, 3)
+        table = reader.read_all()
+        self.assertEqual(table.schema.names, IMAGES_INFO_SCHEMA.names)
+        self.assertEqual(table.column('id').to_pylist(), [0, 1, 2, 3, 4])
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+
+class ColumnarSinkTest(TestCase):
+
+    def test_open_writer_is_abstract(self):
+        with self.assertRaises(TypeError):
+            ColumnarSink(tempfile.gettempdir())
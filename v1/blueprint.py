@@ -1,9 +1,11 @@
 from flask import Blueprint
 from flask_restful import Api
 
+from v1.resources.admin import ProfileResource
 from v1.resources.images import ImagesInfoResource
 from v1.resources.images import ImagesInfoAsyncResource
 from v1.resources.images import BatchPredictResource
+from v1.resources.jobs import JobResource
 
 api_bp = Blueprint('api', __name__)
 api = Api(api_bp)
@@ -14,3 +16,9 @@ api.add_resource(ImagesInfoAsyncResource, '/v1/images_info_async/')
 
 ####### BATCH PREDICT ENDPOINT #####
 api.add_resource(BatchPredictResource, '/v1/batch_predict/')
+
+####### JOBS ENDPOINT ##############
+api.add_resource(JobResource, '/v1/jobs/<string:job_id>/')
+
+####### ADMIN ENDPOINTS ############
+api.add_resource(ProfileResource, '/v1/admin/profiles/<string:request_id>/')
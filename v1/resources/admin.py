@@ -0,0 +1,22 @@
+from flask import Response
+from flask_restful import Resource
+
+from const import status
+from const.profiling import PROFILE_KEY
+from mlteam.extensions import redis_client
+from mlteam.profiling import is_admin
+
+
+class ProfileResource(Resource):
+    """
+    admin profiles endpoint, returns the collapsed stacks of a profiled
+    request, ready for flamegraph.pl. Only for admins.
+    """
+
+    def get(self, request_id):
+        if not is_admin():
+            return {"error": "Unauthorized"}, status.HTTP_401_UNAUTHORIZED
+        profile = redis_client.get(PROFILE_KEY.format(request_id=request_id))
+        if profile is None:
+            return {"error": "Profile not found"}, status.HTTP_404_NOT_FOUND
+        return Response(profile, mimetype='text/plain')
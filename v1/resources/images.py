@@ -1,37 +1,126 @@
 import concurrent.futures
 import os
+from contextlib import nullcontext
 
 import pandas as pd
-from flask import Flask, request
+from flask import Flask, current_app, request
 from flask_restful import Resource
 from redis import Redis
 from simplejson import dumps
 
 from const import status
 from const.redis_queue import IMAGES_INFO_ASYNC, BATCH_PREDICT
-from exceptions import ImageInfoError
-from mlteam.extensions import redis_client, session
+from const.scheduler import INTERACTIVE, BULK
+from const.sinks import PARQUET, ARROW
+from exceptions import ImageInfoError, JobIdError, TooManyJobsError
+from mlteam.extensions import redis_client, scheduler, session
+from mlteam.profiling import profiled
 from models.images import ImageInfo, BatchImage
+from models.sinks import ParquetSink, ArrowSink
+
+SINKS = {
+    PARQUET: ParquetSink,
+    ARROW: ArrowSink,
+}
+
+
+def columnar_sink(name):
+    """
+    Returns the columnar sink called name configured from the current app, or
+    a null context if name is None.
+    """
+    if name is None:
+        return nullcontext()
+    return SINKS[name](
+        current_app.config['RESULTS_DIR'],
+        row_group_size=current_app.config['SINK_BATCH_SIZE'],
+    )
+
+
+def invalid_job_fields(data):
+    """
+    Returns the error response if the job_id or the tenant of the request
+    data are given but are not non-empty strings, None otherwise.
+    """
+    for field in ('job_id', 'tenant'):
+        value = data.get(field)
+        if value is not None and (not isinstance(value, str) or not value):
+            return {"error": "Invalid {field}".format(field=field)}, status.HTTP_400_BAD_REQUEST
+    return None
+
+
+def bulk_job(data):
+    """
+    Returns a BULK scheduler Job for the job_id and tenant of the request
+    data, weighted and capped by the current app configuration, and None. If
+    the job can not be created, returns None and the error response.
+    """
+    tenant = data.get('tenant')
+    try:
+        job = scheduler.job(
+            BULK,
+            job_id=data.get('job_id'),
+            tenant=tenant,
+            weight=current_app.config['TENANT_WEIGHTS'].get(tenant, 1),
+            max_concurrency=current_app.config['BULK_JOB_MAX_CONCURRENCY'],
+            max_jobs=current_app.config['MAX_BULK_JOBS'],
+        )
+    except JobIdError as e:
+        return None, ({"error": str(e)}, status.HTTP_409_CONFLICT)
+    except TooManyJobsError as e:
+        return None, ({"error": str(e)}, status.HTTP_429_TOO_MANY_REQUESTS)
+    return job, None
 
 
 class ImagesInfoResource(Resource):
     """
-    images_info endpoint.
+    images_info endpoint. Small requests are scheduled as INTERACTIVE jobs and
+    the ones with more than INTERACTIVE_MAX_IMAGES images as BULK jobs, which
+    return their job_id.
     """
+    method_decorators = [profiled]
 
     def post(self):
         data = request.get_json()
         if data is None:
             return {"error": "Data is not provided"}, status.HTTP_422_UNPROCESSABLE_ENTITY
 
+        sink_name = data.get('sink')
+        if sink_name is not None and (not isinstance(sink_name, str) or sink_name not in SINKS):
+            return {"error": "Invalid sink"}, status.HTTP_400_BAD_REQUEST
+        error = invalid_job_fields(data)
+        if error is not None:
+            return error
+
         filepath = data.get('filepath', '')
         if os.path.exists(filepath):
             result = {}
             with open(filepath, 'r') as file:
                 images = pd.read_csv(file, delimiter='\t')
-                for image in images.itertuples():
-                        image_info = ImageInfo(image.id, url=image.url, session=session)
-                        result[image.id] = image_info.to_dict()
+            if len(images) > current_app.config['INTERACTIVE_MAX_IMAGES']:
+                job, error = bulk_job(data)
+                if error is not None:
+                    return error
+                # Only BULK jobs are long enough to be cancelled.
+                result["job_id"] = job.id
+            else:
+                job = scheduler.job(INTERACTIVE)
+            with job:
+                future_img = [
+                    (img.id, job.submit(ImageInfo(img.id, url=img.url, session=session).to_dict))
+                    for img in images.itertuples()
+                ]
+                try:
+                    if sink_name is not None:
+                        with columnar_sink(sink_name) as sink:
+                            for img_id, future in future_img:
+                                sink.write(img_id, future.result())
+                        result["location"] = sink.path
+                        return result, status.HTTP_200_OK
+                    for img_id, future in future_img:
+                        result[img_id] = future.result()
+                except concurrent.futures.CancelledError:
+                    return {"ok": "Job cancelled", "job_id": job.id}, status.HTTP_200_OK
             return result, status.HTTP_200_OK
 
         return {"error": "Invalid input file url"}, status.HTTP_422_UNPROCESSABLE_ENTITY
@@ -40,31 +129,52 @@ class ImagesInfoResource(Resource):
 class ImagesInfoAsyncResource(Resource):
     """
     images_info_async endpoint, is a images_info with concurrency for processing
-    images and pushing into a Redis queue.
+    images and pushing into a Redis queue. The images are processed as a BULK
+    job of the given tenant that can be cancelled with its job_id.
     """
+    method_decorators = [profiled]
 
     def post(self):
         data = request.get_json()
         if data is None:
             return {"error": "Data is not provided"}, status.HTTP_422_UNPROCESSABLE_ENTITY
 
+        sink_name = data.get('sink')
+        if sink_name is not None and (not isinstance(sink_name, str) or sink_name not in SINKS):
+            return {"error": "Invalid sink"}, status.HTTP_400_BAD_REQUEST
+        error = invalid_job_fields(data)
+        if error is not None:
+            return error
+
         filepath = data.get('filepath', '')
         if os.path.exists(filepath):
-            result = {}
-            with open(filepath, 'r') as file:
-                images = pd.read_csv(file, delimiter='\t')
-                with concurrent.futures.ThreadPoolExecutor(max_workers=6) as executor:
-                    future_img = {
-                        executor.submit(ImageInfo(img.id, url=img.url, session=session).to_dict): img.id
-                        for img in images.itertuples()
-                    }
+            result = {"ok": "Processing Images"}
+            job, error = bulk_job(data)
+            if error is not None:
+                return error
+            with job, columnar_sink(sink_name) as sink:
+                with open(filepath, 'r') as file:
+                    images = pd.read_csv(file, delimiter='\t')
+                result["job_id"] = job.id
+                if sink is not None:
+                    result["location"] = sink.path
+                future_img = {
+                    job.submit(ImageInfo(img.id, url=img.url, session=session).to_dict): img.id
+                    for img in images.itertuples()
+                }
+                try:
                     for future in concurrent.futures.as_completed(future_img):
                         img_id = future_img[future]
+                        if sink is not None:
+                            sink.write(img_id, future.result())
+                            continue
                         redis_client.rpush(
                             IMAGES_INFO_ASYNC,
                             dumps({img_id: future.result()})
                         )
-            return {"ok": "Processing Images"}, status.HTTP_200_OK
+                except concurrent.futures.CancelledError:
+                    result["ok"] = "Job cancelled"
+            return result, status.HTTP_200_OK
 
         return {"error": "Invalid input file url"}, status.HTTP_422_UNPROCESSABLE_ENTITY
 
@@ -73,22 +183,36 @@ class BatchPredictResource(Resource):
     """
     batch_predict endpoint.
     """
+    method_decorators = [profiled]
 
     def post(self):
         data = request.get_json()
         if data is None:
             return {"error": "Data is not provided"}, status.HTTP_422_UNPROCESSABLE_ENTITY
 
+        error = invalid_job_fields(data)
+        if error is not None:
+            return error
+
         filepath = data.get('filepath', '')
         if os.path.exists(filepath):
             batch_size = data.get('batch_size', 0)
             if batch_size == 0:
                 # If there is not batch size, all the images are processed.
                 return {"ok": "Processing Images"}, status.HTTP_200_OK
-            with open(filepath, 'r') as file:
-                images = pd.read_csv(file, delimiter='\t')
-                batch_images = BatchImage(images=images.itertuples(), batch_size=batch_size, session=session)
-                batch_images.resize_batch_images(redis_conn=redis_client)
-            return {"ok": "Processing Images"}, status.HTTP_200_OK
+            result = {"ok": "Processing Images"}
+            job, error = bulk_job(data)
+            if error is not None:
+                return error
+            with job:
+                with open(filepath, 'r') as file:
+                    images = pd.read_csv(file, delimiter='\t')
+                result["job_id"] = job.id
+                batch_images = BatchImage(images=images.itertuples(), batch_size=batch_size, session=session, job=job)
+                try:
+                    batch_images.resize_batch_images(redis_conn=redis_client)
+                except concurrent.futures.CancelledError:
+                    result["ok"] = "Job cancelled"
+            return result, status.HTTP_200_OK
 
         return {"error": "Invalid input file url"}, status.HTTP_422_UNPROCESSABLE_ENTITY
@@ -0,0 +1,15 @@
+from flask_restful import Resource
+
+from const import status
+from mlteam.extensions import scheduler
+
+
+class JobResource(Resource):
+    """
+    jobs endpoint, cancels the pending images of a running job.
+    """
+
+    def delete(self, job_id):
+        if scheduler.cancel(job_id):
+            return {"ok": "Job cancelled"}, status.HTTP_200_OK
+        return {"error": "Job not found"}, status.HTTP_404_NOT_FOUND
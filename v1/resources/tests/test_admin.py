@@ -0,0 +1,123 @@
+import re
+import time
+from io import BytesIO
+from unittest.mock import mock_open, patch
+from unittest import TestCase
+
+import requests_mock
+from PIL import Image
+from redis import Redis
+from redis.exceptions import RedisError
+from simplejson import loads
+
+from mlteam import create_app
+
+
+class ProfileResourceTest(TestCase):
+
+    def setUp(self):
+        self.app = create_app(config_obj='mlteam.config.TestingConfig')
+        # Redis testing propouse.
+        self.redis_client = Redis(host='localhost', port=6379, db=0)
+
+    def test_profiled_request_is_retrievable(self):
+        headers = {'X-Profile': '1', 'X-Request-Id': 'tst-request', 'X-Admin-Token': 'tst-token'}
+        data = {'filepath': '/redpoints/src/dependencies/images.tsv'}
+
+        images_tsv = "id\turl\n0\thttps://www.url.com/blank_image"
+        blank = Image.new('RGB', (64,64))
+        with BytesIO() as output:
+            blank.save(output, format="GIF")
+            img_buf = output.getvalue()
+
+        def slow_image(request, context):
+            # Gives the profiler time to take some samples.
+            time.sleep(0.1)
+            return img_buf
+
+        with patch('os.path.exists', return_value=True):
+            with patch('builtins.open', mock_open(read_data=images_tsv)):
+                with requests_mock.mock() as m:
+                    with self.app.test_client() as cli:
+                        m.get('https://www.url.com/blank_image', content=slow_image)
+                        resp = cli.post('/api/v1/images_info/', json=data, headers=headers)
+                        self.assertEqual(resp.status_code, 200)
+                        self.assertEqual(resp.headers['X-Request-Id'], 'tst-request')
+                        resp = cli.get('/api/v1/admin/profiles/tst-request/', headers=headers)
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.mimetype, 'text/plain')
+        lines = resp.data.decode().splitlines()
+        self.assertTrue(lines)
+        for line in lines:
+            # Collapsed stacks: 'thread;frame;frame count'.
+            self.assertRegex(line, r'^[^;]+(;[^;]+)+ \d+$')
+        # The image is fetched by a scheduler worker of the request.
+        self.assertTrue(any(re.search(r'to_dict \(images\.py:\d+\)', line) for line in lines))
+        # Meanwhile the handler waits for its tasks.
+        self.assertTrue(any(re.search(r'post \(images\.py:\d+\);.*;<waiting> \d+$', line) for line in lines))
+
+    def test_profile_header_needs_the_admin_token(self):
+        for headers in ({'X-Profile': '1'}, {'X-Profile': '1', 'X-Admin-Token': 'wrong'}):
+            with self.app.test_client() as cli:
+                resp = cli.post('/api/v1/images_info/', headers=headers)
+                self.assertNotIn('X-Request-Id', resp.headers)
+
+    def test_profile_header_is_a_boolean(self):
+        headers = {'X-Profile': '0', 'X-Admin-Token': 'tst-token'}
+        with self.app.test_client() as cli:
+            resp = cli.post('/api/v1/images_info/', headers=headers)
+            self.assertNotIn('X-Request-Id', resp.headers)
+
+    def test_invalid_request_id_is_replaced(self):
+        headers = {'X-Profile': 'true', 'X-Request-Id': 'a:b' * 40, 'X-Admin-Token': 'tst-token'}
+        with self.app.test_client() as cli:
+            resp = cli.post('/api/v1/images_info/', headers=headers)
+            self.assertRegex(resp.headers['X-Request-Id'], r'^[0-9a-f]{32}$')
+
+    def test_sampled_request_id_is_generated(self):
+        self.app.config['PROFILING_ENABLED'] = True
+        with self.app.test_client() as cli:
+            resp = cli.post('/api/v1/images_info/', headers={'X-Request-Id': 'tst-request'})
+            self.assertRegex(resp.headers['X-Request-Id'], r'^[0-9a-f]{32}$')
+
+    def test_admin_endpoints_are_not_profiled(self):
+        self.app.config['PROFILING_ENABLED'] = True
+        headers = {'X-Admin-Token': 'tst-token'}
+        with self.app.test_client() as cli:
+            resp = cli.get('/api/v1/admin/profiles/unknown/', headers=headers)
+            self.assertEqual(resp.status_code, 404)
+            self.assertNotIn('X-Request-Id', resp.headers)
+
+    def test_redis_error_does_not_fail_the_request(self):
+        headers = {'X-Profile': '1', 'X-Request-Id': 'tst-request', 'X-Admin-Token': 'tst-token'}
+        with patch('mlteam.profiling.redis_client.set', side_effect=RedisError()):
+            with self.app.test_client() as cli:
+                resp = cli.post('/api/v1/images_info/', headers=headers)
+                self.assertEqual(resp.status_code, 422)
+                self.assertNotIn('X-Request-Id', resp.headers)
+
+    def test_request_without_profiling(self):
+        with self.app.test_client() as cli:
+            resp = cli.post('/api/v1/images_info/')
+            self.assertNotIn('X-Request-Id', resp.headers)
+
+    def test_status_401_without_admin_token(self):
+        with self.app.test_client() as cli:
+            resp = cli.get('/api/v1/admin/profiles/unknown/')
+            expected = {
+                "error": "Unauthorized"
+            }
+            self.assertEqual(resp.status_code, 401)
+            self.assertEqual(loads(resp.data), expected)
+
+    def test_status_404_profile_not_found(self):
+        with self.app.test_client() as cli:
+            resp = cli.get('/api/v1/admin/profiles/unknown/', headers={'X-Admin-Token': 'tst-token'})
+            expected = {
+                "error": "Profile not found"
+            }
+            self.assertEqual(resp.status_code, 404)
+            self.assertEqual(loads(resp.data), expected)
+
+    def tearDown(self):
+        self.redis_client.flushdb()
@@ -1,7 +1,9 @@
+import tempfile
 from io import BytesIO
 from unittest.mock import mock_open, patch
 from unittest import TestCase
 
+import pyarrow.parquet as pq
 import requests_mock
 from PIL import Image
 from simplejson import loads
@@ -44,6 +46,54 @@ class ImagesInfoResourceTest(TestCase):
                         self.assertEqual(resp.status_code, 200)
                         self.assertEqual(loads(resp.data), expected)
 
+    def test_status_ok_with_parquet_sink(self):
+        data = {'filepath': '/redpoints/src/dependencies/images.tsv', 'sink': 'parquet'}
+
+        images_tsv = "id\turl\n0\thttps://www.url.com/blank_image"
+        blank = Image.new('RGB', (64,64))
+        img_buf = None
+        with BytesIO() as output:
+            blank.save(output, format="GIF")
+            img_buf = output.getvalue()
+
+        with tempfile.TemporaryDirectory() as results_dir:
+            self.app.config['RESULTS_DIR'] = results_dir
+            with patch('os.path.exists', return_value=True):
+                with patch('builtins.open', mock_open(read_data=images_tsv)):
+                    with requests_mock.mock() as m:
+                        with self.app.test_client() as cli:
+                            m.get('https://www.url.com/blank_image', content=img_buf)
+                            resp = cli.post('/api/v1/images_info/', json=data)
+            self.assertEqual(resp.status_code, 200)
+            location = loads(resp.data)['location']
+            self.assertTrue(location.startswith(results_dir))
+            result = pq.read_table(location).to_pydict()
+            self.assertEqual(result['id'], [0])
+            self.assertEqual(result['size'], [len(img_buf)])
+            self.assertEqual(result['format'], ['GIF'])
+
+    def test_status_400_invalid_sink(self):
+        data = {'filepath': '/redpoints/src/dependencies/images.tsv', 'sink': 'csv'}
+
+        with self.app.test_client() as cli:
+            resp = cli.post('/api/v1/images_info/', json=data)
+            expected = {
+                "error": "Invalid sink"
+            }
+            self.assertEqual(resp.status_code, 400)
+            self.assertEqual(loads(resp.data), expected)
+
+    def test_status_400_sink_is_not_a_string(self):
+        data = {'filepath': '/redpoints/src/dependencies/images.tsv', 'sink': []}
+
+        with self.app.test_client() as cli:
+            resp = cli.post('/api/v1/images_info/', json=data)
+            expected = {
+                "error": "Invalid sink"
+            }
+            self.assertEqual(resp.status_code, 400)
+            self.assertEqual(loads(resp.data), expected)
+
     def test_status_422_data_is_not_provieded(self):
         with self.app.test_client() as cli:
             resp = cli.post('/api/v1/images_info/')
@@ -72,7 +122,7 @@ class ImagesInfoAsyncResourceTest(TestCase):
         self.app = create_app(config_obj='mlteam.config.TestingConfig')
 
     def test_status_ok(self):
-        data = {'filepath': '/redpoints/src/dependencies/images.tsv'}
+        data = {'filepath': '/redpoints/src/dependencies/images.tsv', 'job_id': 'tst-job'}
 
         images_tsv = "id\turl\n0\thttps://www.url.com/blank_image"
         blank = Image.new('RGB', (64,64))
@@ -89,11 +139,34 @@ class ImagesInfoAsyncResourceTest(TestCase):
                         m.get('https://www.url.com/blank_image', content=img_buf)
                         resp = cli.post('/api/v1/images_info_async/', json=data)
                         expected = {
-                            "ok": "Processing Images"
+                            "ok": "Processing Images",
+                            "job_id": "tst-job",
                         }
                         self.assertEqual(resp.status_code, 200)
                         self.assertEqual(loads(resp.data), expected)
 
+    def test_status_400_invalid_sink(self):
+        data = {'filepath': '/redpoints/src/dependencies/images.tsv', 'sink': 'csv'}
+
+        with self.app.test_client() as cli:
+            resp = cli.post('/api/v1/images_info_async/', json=data)
+            expected = {
+                "error": "Invalid sink"
+            }
+            self.assertEqual(resp.status_code, 400)
+            self.assertEqual(loads(resp.data), expected)
+
+    def test_status_400_sink_is_not_a_string(self):
+        data = {'filepath': '/redpoints/src/dependencies/images.tsv', 'sink': []}
+
+        with self.app.test_client() as cli:
+            resp = cli.post('/api/v1/images_info_async/', json=data)
+            expected = {
+                "error": "Invalid sink"
+            }
+            self.assertEqual(resp.status_code, 400)
+            self.assertEqual(loads(resp.data), expected)
+
     def test_status_422_data_is_not_provieded(self):
         with self.app.test_client() as cli:
             resp = cli.post('/api/v1/images_info_async/')
@@ -145,7 +218,7 @@ class BatchPredictResourceTest(TestCase):
                         self.assertEqual(loads(resp.data), expected)
 
     def test_status_ok_with_batch_size(self):
-        data = {'filepath': '/redpoints/src/dependencies/images.tsv', 'batch_size': 5}
+        data = {'filepath': '/redpoints/src/dependencies/images.tsv', 'batch_size': 5, 'job_id': 'tst-job'}
 
         images_tsv = "id\turl\n0\thttps://www.url.com/blank_image"
         blank = Image.new('RGB', (64,64))
@@ -162,7 +235,8 @@ class BatchPredictResourceTest(TestCase):
                         m.get('https://www.url.com/blank_image', content=img_buf)
                         resp = cli.post('/api/v1/batch_predict/', json=data)
                         expected = {
-                            "ok": "Processing Images"
+                            "ok": "Processing Images",
+                            "job_id": "tst-job",
                         }
                         self.assertEqual(resp.status_code, 200)
                         self.assertEqual(loads(resp.data), expected)
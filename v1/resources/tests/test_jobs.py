@@ -0,0 +1,178 @@
+import os
+import re
+import tempfile
+import threading
+from io import BytesIO
+from unittest import TestCase
+
+import requests_mock
+from PIL import Image
+from redis import Redis
+from simplejson import loads
+
+from const.scheduler import BULK
+from mlteam import create_app
+from mlteam.extensions import scheduler
+
+
+class JobResourceTest(TestCase):
+
+    def setUp(self):
+        self.app = create_app(config_obj='mlteam.config.TestingConfig')
+
+    def test_status_ok_job_cancelled(self):
+        with scheduler.job(BULK, job_id='tst-job') as job:
+            with self.app.test_client() as cli:
+                resp = cli.delete('/api/v1/jobs/tst-job/')
+                expected = {
+                    "ok": "Job cancelled"
+                }
+                self.assertEqual(resp.status_code, 200)
+                self.assertEqual(loads(resp.data), expected)
+                self.assertTrue(job.cancelled)
+
+    def test_status_404_job_not_found(self):
+        with self.app.test_client() as cli:
+            resp = cli.delete('/api/v1/jobs/unknown/')
+            expected = {
+                "error": "Job not found"
+            }
+            self.assertEqual(resp.status_code, 404)
+            self.assertEqual(loads(resp.data), expected)
+
+
+class ConcurrentJobsTest(TestCase):
+    """
+    Runs a BULK images_info_async request and other requests at the same
+    time, as a threaded server does.
+    """
+
+    def setUp(self):
+        self.app = create_app(config_obj='mlteam.config.TestingConfig')
+        # Redis testing propouse.
+        self.redis_client = Redis(host='localhost', port=6379, db=0)
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.bulk_tsv = os.path.join(self.tmp_dir.name, 'bulk.tsv')
+        with open(self.bulk_tsv, 'w') as file:
+            file.write("id\turl\n")
+            for n in range(6):
+                file.write("{n}\thttps://www.url.com/bulk_{n}\n".format(n=n))
+        self.small_tsv = os.path.join(self.tmp_dir.name, 'small.tsv')
+        with open(self.small_tsv, 'w') as file:
+            file.write("id\turl\n0\thttps://www.url.com/small\n")
+        blank = Image.new('RGB', (64,64))
+        with BytesIO() as output:
+            blank.save(output, format="GIF")
+            self.img_buf = output.getvalue()
+        # The bulk images are blocked until the gate is set.
+        self.started = threading.Event()
+        self.gate = threading.Event()
+        self.responses = []
+        self.bulk = threading.Thread(target=self._post_bulk)
+
+    def _bulk_image(self, request, context):
+        self.started.set()
+        self.gate.wait(5)
+        return self.img_buf
+
+    def _post_bulk(self):
+        data = {'filepath': self.bulk_tsv, 'job_id': 'tst-bulk'}
+        with self.app.test_client() as cli:
+            self.responses.append(cli.post('/api/v1/images_info_async/', json=data))
+
+    def _mock(self, m):
+        m.get(re.compile(r'https://www\.url\.com/bulk_\d+'), content=self._bulk_image)
+        m.get('https://www.url.com/small', content=self.img_buf)
+
+    def test_interactive_request_does_not_wait_for_bulk(self):
+        with requests_mock.mock() as m:
+            self._mock(m)
+            self.bulk.start()
+            self.assertTrue(self.started.wait(5))
+            with self.app.test_client() as cli:
+                resp = cli.post('/api/v1/images_info/', json={'filepath': self.small_tsv})
+            self.assertEqual(resp.status_code, 200)
+            self.assertEqual(loads(resp.data)["0"]["image_info"]["image_size"], len(self.img_buf))
+            # The bulk request is still blocked on its images.
+            self.assertTrue(self.bulk.is_alive())
+            self.gate.set()
+            self.bulk.join(5)
+        self.assertEqual(self.responses[0].status_code, 200)
+        self.assertEqual(loads(self.responses[0].data)["ok"], "Processing Images")
+
+    def test_cancel_running_job(self):
+        with requests_mock.mock() as m:
+            self._mock(m)
+            self.bulk.start()
+            self.assertTrue(self.started.wait(5))
+            with self.app.test_client() as cli:
+                resp = cli.delete('/api/v1/jobs/tst-bulk/')
+            self.assertEqual(resp.status_code, 200)
+            self.gate.set()
+            self.bulk.join(5)
+        self.assertFalse(self.bulk.is_alive())
+        expected = {
+            "ok": "Job cancelled",
+            "job_id": "tst-bulk",
+        }
+        self.assertEqual(loads(self.responses[0].data), expected)
+
+    def test_status_409_job_id_in_use(self):
+        with scheduler.job(BULK, job_id='tst-bulk'):
+            self._post_bulk()
+        expected = {
+            "error": "Job id tst-bulk is already in use."
+        }
+        self.assertEqual(self.responses[0].status_code, 409)
+        self.assertEqual(loads(self.responses[0].data), expected)
+
+    def test_status_429_too_many_bulk_jobs(self):
+        # TestingConfig allows 2 BULK jobs at once.
+        with scheduler.job(BULK), scheduler.job(BULK):
+            self._post_bulk()
+        self.assertEqual(self.responses[0].status_code, 429)
+
+    def test_status_400_tenant_is_not_a_string(self):
+        data = {'filepath': self.bulk_tsv, 'tenant': ['a']}
+        with self.app.test_client() as cli:
+            resp = cli.post('/api/v1/images_info_async/', json=data)
+            expected = {
+                "error": "Invalid tenant"
+            }
+            self.assertEqual(resp.status_code, 400)
+            self.assertEqual(loads(resp.data), expected)
+
+    def test_status_400_job_id_is_not_a_string(self):
+        data = {'filepath': self.bulk_tsv, 'job_id': 1}
+        with self.app.test_client() as cli:
+            resp = cli.post('/api/v1/images_info/', json=data)
+            expected = {
+                "error": "Invalid job_id"
+            }
+            self.assertEqual(resp.status_code, 400)
+            self.assertEqual(loads(resp.data), expected)
+
+    def test_large_images_info_is_a_bulk_job(self):
+        self.app.config['INTERACTIVE_MAX_IMAGES'] = 0
+        data = {'filepath': self.small_tsv, 'job_id': 'tst-small'}
+        with requests_mock.mock() as m:
+            self._mock(m)
+            with self.app.test_client() as cli:
+                resp = cli.post('/api/v1/images_info/', json=data)
+        self.assertEqual(resp.status_code, 200)
+        result = loads(resp.data)
+        self.assertEqual(result["job_id"], "tst-small")
+        self.assertEqual(result["0"]["image_info"]["image_size"], len(self.img_buf))
+
+    def test_large_images_info_status_409_job_id_in_use(self):
+        self.app.config['INTERACTIVE_MAX_IMAGES'] = 0
+        data = {'filepath': self.small_tsv, 'job_id': 'tst-small'}
+        with scheduler.job(BULK, job_id='tst-small'):
+            with self.app.test_client() as cli:
+                resp = cli.post('/api/v1/images_info/', json=data)
+        self.assertEqual(resp.status_code, 409)
+
+    def tearDown(self):
+        self.gate.set()
+        self.tmp_dir.cleanup()
+        self.redis_client.flushdb()